@@ -9,181 +9,197 @@
 python inject_content.py --template <模板目录> --output <输出文件> --content <内容文件>
 """
 
+import io
 import os
 import sys
-import re
-import xml.etree.ElementTree as ET
-from pathlib import Path
+import argparse
 from typing import Dict, List, Optional
 
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    try:
+        # Python < 3.9 需显式导入 C 加速版本
+        import xml.etree.cElementTree as ET
+    except ImportError:
+        # Python 3.9+ 中 ElementTree 会自动使用 _elementtree C 加速
+        import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+
+def _has_c_accelerator() -> bool:
+    """检查 XML 解析是否运行在 C 实现之上"""
+    if HAS_LXML:
+        return True
+    try:
+        import _elementtree
+    except ImportError:
+        return False
+    return ET.Element is _elementtree.Element
+
+
+# WordprocessingML 命名空间
+WNS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+ET.register_namespace('w', WNS)
+
+# 内容文件中的字段前缀，按行首两个字分派：行首两字 -> (完整前缀, 字段名)
+_PREFIX = {
+    '题目': ('题目：', 'title'),
+    '摘要': ('摘要：', 'abstract'),
+    '关键': ('关键词：', 'keywords'),
+    '参考': ('参考文献：', 'references'),
+}
+
 
 class WordDocumentInjector:
     """Word文档内容注入器"""
 
-    def __init__(self, template_dir: str):
+    # 预先拼好的限定名，避免每次创建元素时格式化字符串
+    W = WNS
+    _W_P = f'{{{W}}}p'
+    _W_R = f'{{{W}}}r'
+    _W_RPR = f'{{{W}}}rPr'
+    _W_RSTYLE = f'{{{W}}}rStyle'
+    _W_T = f'{{{W}}}t'
+    _W_VAL = f'{{{W}}}val'
+    _W_SPACE = f'{{{W}}}space'
+
+    # 段落样式名，驻留后所有新建段落共享同一字符串对象
+    _STYLE_HEADING1 = sys.intern('Heading1')
+    _STYLE_HEADING2 = sys.intern('Heading2')
+    _STYLE_SUBTITLE = sys.intern('Subtitle')
+
+    # lxml 下预编译查找表达式，标准库则沿用 find/findall
+    if HAS_LXML:
+        _FIND_BODY = ET.XPath('w:body', namespaces={'w': W})
+        _FIND_P = ET.XPath('.//w:p', namespaces={'w': W})
+
+        # 模板只需读取和追加段落：不建立 xml:id 索引、不展开实体，降低解析开销和内存占用
+        _PARSER = ET.XMLParser(collect_ids=False, resolve_entities=False)
+
+    def __init__(self, template_dir: Optional[str] = None):
         self.template_dir = template_dir
-        self.namespace = {
-            'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
-        }
+        self.namespace = {'w': WNS}
 
-        # 检查模板目录
-        if not os.path.exists(template_dir):
-            raise Exception(f"模板目录不存在: {template_dir}")
+        # 不指定模板目录时只处理内存中的文档（见 load_document_bytes）
+        if template_dir is None:
+            self.document_path = self.styles_path = None
+            return
 
-        # 检查必需文件
-        self.document_path = os.path.join(template_dir, 'word', 'document.xml')
-        self.styles_path = os.path.join(template_dir, 'word', 'styles.xml')
+        word_dir = os.path.join(template_dir, 'word')
+        self.document_path = os.path.join(word_dir, 'document.xml')
+        self.styles_path = os.path.join(word_dir, 'styles.xml')
 
-        if not os.path.exists(self.document_path):
+        # 一次列出word目录，再在内存中检查必需文件
+        try:
+            with os.scandir(word_dir) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            # 检查模板目录
+            if not os.path.isdir(template_dir):
+                raise Exception(f"模板目录不存在: {template_dir}")
+            names = set()
+
+        # 检查必需文件
+        if 'document.xml' not in names:
             raise Exception(f"document.xml 不存在: {self.document_path}")
 
     def load_document(self) -> ET.ElementTree:
         """加载文档XML"""
+        return self._parse(self.document_path)
+
+    def load_document_bytes(self, data: bytes) -> ET.ElementTree:
+        """从内存中的 document.xml 内容加载文档"""
+        return self._parse(io.BytesIO(data))
+
+    def _parse(self, source) -> ET.ElementTree:
+        """解析文件路径或文件对象"""
         try:
-            tree = ET.parse(self.document_path)
-            return tree
+            if HAS_LXML:
+                return ET.parse(source, self._PARSER)
+
+            # 标准库在序列化时会把未注册的前缀改写为 ns0、ns1 ...，
+            # 解析的同时登记模板中的命名空间前缀，保证 mc:Ignorable 等引用有效
+            parser = ET.iterparse(source, events=('start-ns',))
+            for _, (prefix, uri) in parser:
+                if prefix:
+                    ET.register_namespace(prefix, uri)
+            return ET.ElementTree(parser.root)
         except Exception as e:
             raise Exception(f"加载文档失败: {e}")
 
     def find_body(self, tree: ET.ElementTree) -> ET.Element:
         """查找body元素"""
         root = tree.getroot()
-        body = root.find('w:body', self.namespace)
+        if HAS_LXML:
+            bodies = self._FIND_BODY(root)
+            body = bodies[0] if bodies else None
+        else:
+            body = root.find('w:body', self.namespace)
         if body is None:
             raise Exception("未找到body元素")
         return body
 
-    def inject_title(self, body: ET.Element, title: str):
-        """注入标题"""
-        # 创建段落
-        p = ET.Element('w:p')
-        p.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-        # 创建文本运行
-        r = ET.Element('w:r')
-        rPr = ET.SubElement(r, 'w:rPr')
+    def _make_styled_para(self, style_val: Optional[str], text: str) -> ET.Element:
+        """构造一个段落：<w:p><w:r>[<w:rPr><w:rStyle/></w:rPr>]<w:t/></w:r></w:p>"""
+        SubElement = ET.SubElement
 
-        # 设置标题样式
-        rStyle = ET.SubElement(rPr, 'w:rStyle')
-        rStyle.set(f"{{{self.namespace['w']}}}val", "Heading1")
+        p = ET.Element(self._W_P, {self._W_SPACE: "preserve"})
+        r = SubElement(p, self._W_R)
+        if style_val:
+            SubElement(SubElement(r, self._W_RPR), self._W_RSTYLE, {self._W_VAL: style_val})
+        SubElement(r, self._W_T).text = text
+        return p
 
-        # 创建文本
-        t = ET.SubElement(r, 'w:t')
-        t.text = title
-
-        p.append(r)
-        body.insert(0, p)
+    def inject_title(self, body: ET.Element, title: str):
+        """注入标题"""
+        body.insert(0, self._make_styled_para(self._STYLE_HEADING1, title))
 
     def inject_abstract(self, body: ET.Element, abstract: str):
         """注入摘要"""
-        # 创建摘要标题
-        p = ET.Element('w:p')
-        p.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-        r = ET.SubElement(p, 'w:r')
-        rPr = ET.SubElement(r, 'w:rPr')
-        rStyle = ET.SubElement(rPr, 'w:rStyle')
-        rStyle.set(f"{{{self.namespace['w']}}}val", "Subtitle")
-
-        t = ET.SubElement(r, 'w:t')
-        t.text = "摘要"
-
-        # 创建摘要内容
-        p2 = ET.Element('w:p')
-        p2.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-        r2 = ET.SubElement(p2, 'w:r')
-        t2 = ET.SubElement(r2, 'w:t')
-        t2.text = abstract
-
-        # 插入到body中
-        body.append(p)
-        body.append(p2)
+        body.append(self._make_styled_para(self._STYLE_SUBTITLE, "摘要"))
+        body.append(self._make_styled_para(None, abstract))
 
     def inject_keywords(self, body: ET.Element, keywords: str):
         """注入关键词"""
-        p = ET.Element('w:p')
-        p.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-        r = ET.SubElement(p, 'w:r')
-        rPr = ET.SubElement(r, 'w:rPr')
-        rStyle = ET.SubElement(rPr, 'w:rStyle')
-        rStyle.set(f"{{{self.namespace['w']}}}val", "Subtitle")
-
-        t = ET.SubElement(r, 'w:t')
-        t.text = "关键词"
-
-        # 创建关键词内容
-        p2 = ET.Element('w:p')
-        p2.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-        r2 = ET.SubElement(p2, 'w:r')
-        t2 = ET.SubElement(r2, 'w:t')
-        t2.text = keywords
-
-        body.append(p)
-        body.append(p2)
+        body.append(self._make_styled_para(self._STYLE_SUBTITLE, "关键词"))
+        body.append(self._make_styled_para(None, keywords))
 
     def inject_section(self, body: ET.Element, section_name: str, content: str):
         """注入章节"""
-        # 创建章节标题
-        p = ET.Element('w:p')
-        p.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-        r = ET.SubElement(p, 'w:r')
-        rPr = ET.SubElement(r, 'w:rPr')
-        rStyle = ET.SubElement(rPr, 'w:rStyle')
-        rStyle.set(f"{{{self.namespace['w']}}}val", "Heading2")
+        make_para = self._make_styled_para
 
-        t = ET.SubElement(r, 'w:t')
-        t.text = section_name
+        # 章节标题在前，正文段落在后；先收集再一次性追加到body
+        new_ps = [make_para(self._STYLE_HEADING2, section_name)]
 
-        # 创建章节内容
         if content:
             # 按段落分割内容
-            paragraphs = content.split('\n\n')
-            for para_text in paragraphs:
-                if para_text.strip():
-                    p_content = ET.Element('w:p')
-                    p_content.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-                    r_content = ET.SubElement(p_content, 'w:r')
-                    t_content = ET.SubElement(r_content, 'w:t')
-                    t_content.text = para_text.strip()
+            for para_text in content.split('\n\n'):
+                para_text = para_text.strip()
+                if para_text:
+                    new_ps.append(make_para(None, para_text))
 
-                    body.append(p_content)
-
-        body.append(p)
+        body.extend(new_ps)
 
     def inject_references(self, body: ET.Element, references: List[str]):
         """注入参考文献"""
-        # 创建参考文献标题
-        p = ET.Element('w:p')
-        p.set(f"{{{self.namespace['w']}}}space", "preserve")
-
-        r = ET.SubElement(p, 'w:r')
-        rPr = ET.SubElement(r, 'w:rPr')
-        rStyle = ET.SubElement(rPr, 'w:rStyle')
-        rStyle.set(f"{{{self.namespace['w']}}}val", "Heading2")
-
-        t = ET.SubElement(r, 'w:t')
-        t.text = "参考文献"
+        make_para = self._make_styled_para
 
         # 注入每条参考文献
-        for i, ref in enumerate(references, 1):
-            p_ref = ET.Element('w:p')
-            p_ref.set(f"{{{self.namespace['w']}}}space", "preserve")
+        new_ps = [make_para(self._STYLE_HEADING2, "参考文献")]
+        new_ps.extend(make_para(None, ref) for ref in references)
 
-            r_ref = ET.SubElement(p_ref, 'w:r')
-            t_ref = ET.SubElement(r_ref, 'w:t')
-            t_ref.text = ref
-
-            body.append(p_ref)
+        body.extend(new_ps)
 
     def inject_content(self, content: Dict) -> ET.ElementTree:
         """注入所有内容"""
         # 加载文档
         tree = self.load_document()
+        return self.inject_tree(tree, content)
+
+    def inject_tree(self, tree: ET.ElementTree, content: Dict) -> ET.ElementTree:
+        """向已加载的文档注入所有内容"""
         body = self.find_body(tree)
 
         # 清空现有内容（保留模板结构）
@@ -218,12 +234,26 @@ class WordDocumentInjector:
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
-            # 保存XML
-            tree.write(output_path, encoding='utf-8', xml_declaration=True)
+            # 保存XML：两种实现的 write 都是边序列化边写入磁盘，
+            # 不会先在内存中拼出整篇文档的字符串
+            # （lxml 支持 standalone 声明，与 Word 原始输出保持一致）。
+            # 这里是中间产物，随后由 pack_document 打包成 docx，
+            # 打包才是持久化的边界，因此使用大缓冲区写入且不调用 os.fsync
+            with open(output_path, 'wb', buffering=1 << 20) as f:
+                if HAS_LXML:
+                    tree.write(f, encoding='utf-8', xml_declaration=True, standalone=True)
+                else:
+                    tree.write(f, encoding='utf-8', xml_declaration=True)
             print(f"文档已保存到: {output_path}")
         except Exception as e:
             raise Exception(f"保存文档失败: {e}")
 
+    def serialize_document(self, tree: ET.ElementTree) -> bytes:
+        """将文档序列化为字节串（声明与 save_document 一致）"""
+        if HAS_LXML:
+            return ET.tostring(tree, encoding='UTF-8', xml_declaration=True, standalone=True)
+        return ET.tostring(tree.getroot(), encoding='utf-8', xml_declaration=True)
+
     def validate_injection(self, tree: ET.ElementTree) -> bool:
         """验证注入结果"""
         try:
@@ -233,7 +263,10 @@ class WordDocumentInjector:
                 return False
 
             # 检查是否有内容
-            paragraphs = body.findall('.//w:p', self.namespace)
+            if HAS_LXML:
+                paragraphs = self._FIND_P(body)
+            else:
+                paragraphs = body.findall('.//w:p', self.namespace)
             if len(paragraphs) < 2:  # 至少应该有标题
                 print("警告：注入的内容可能过少")
                 return False
@@ -257,6 +290,8 @@ def load_content_from_file(file_path: str) -> Dict:
 
         result = {}
         current_section = None
+        # 各章节的行先收集到列表中，最后统一拼接，避免反复拼接字符串
+        section_buffers: Dict[str, List[str]] = {}
 
         for line in lines:
             line = line.strip()
@@ -264,29 +299,24 @@ def load_content_from_file(file_path: str) -> Dict:
                 continue
 
             # 检测特殊字段
-            if line.startswith('题目：'):
-                result['title'] = line[3:].strip()
-            elif line.startswith('摘要：'):
-                result['abstract'] = line[3:].strip()
-            elif line.startswith('关键词：'):
-                result['keywords'] = line[4:].strip()
-            elif line.startswith('参考文献：'):
-                # 这里简化处理，实际应该逐条解析
-                result['references'] = [line]
-            elif line.startswith('第') and '章' in line:
-                current_section = line
-                result['sections'] = result.get('sections', {})
-                result['sections'][current_section] = ""
-            elif current_section and line.startswith('第') and '章' in line:
-                # 新章节开始
-                result['sections'][current_section] = result['sections'].get(current_section, "")
-                current_section = line
-                result['sections'][current_section] = ""
+            field = _PREFIX.get(line[:2])
+            if field and line.startswith(field[0]):
+                prefix, tag = field
+                if tag == 'references':
+                    # 这里简化处理，实际应该逐条解析
+                    result['references'] = [line]
+                else:
+                    result[tag] = line[len(prefix):].strip()
+            elif line[0] == '第' and '章' in line:
+                # 新章节开始；章节名会反复作为字典键使用，驻留以加快哈希比较
+                current_section = sys.intern(line)
+                section_buffers[current_section] = []
             else:
                 if current_section:
-                    if current_section not in result['sections']:
-                        result['sections'][current_section] = ""
-                    result['sections'][current_section] += line + '\n'
+                    section_buffers[current_section].append(line)
+
+        if section_buffers:
+            result['sections'] = {name: '\n'.join(buf) for name, buf in section_buffers.items()}
 
         return result
 
@@ -294,45 +324,37 @@ def load_content_from_file(file_path: str) -> Dict:
         raise Exception(f"加载内容文件失败：{e}")
 
 
-def main():
-    """主函数"""
-    if len(sys.argv) < 7:
-        print("使用方法:")
-        print("  python inject_content.py --template <模板目录> --output <输出文件> --content <内容文件>")
-        sys.exit(1)
+def run_inject(template_dir: str, output_file: str, content_file: str) -> bool:
+    """注入内容并保存文档，返回注入结果是否通过验证"""
+    if not _has_c_accelerator():
+        print("警告：未检测到 lxml 或 C 加速的 ElementTree，处理大文档可能较慢")
 
-    # 解析参数
-    template_dir = None
-    output_file = None
-    content_file = None
-
-    for i, arg in enumerate(sys.argv):
-        if arg == '--template' and i + 1 < len(sys.argv):
-            template_dir = sys.argv[i + 1]
-        elif arg == '--output' and i + 1 < len(sys.argv):
-            output_file = sys.argv[i + 1]
-        elif arg == '--content' and i + 1 < len(sys.argv):
-            content_file = sys.argv[i + 1]
-
-    if not template_dir or not output_file or not content_file:
-        print("参数错误：缺少必需的参数")
-        sys.exit(1)
+    # 创建注入器
+    injector = WordDocumentInjector(template_dir)
 
-    try:
-        # 创建注入器
-        injector = WordDocumentInjector(template_dir)
+    # 加载内容
+    content = load_content_from_file(content_file)
+
+    # 注入内容
+    tree = injector.inject_content(content)
+
+    # 保存文档
+    injector.save_document(tree, output_file)
 
-        # 加载内容
-        content = load_content_from_file(content_file)
+    # 验证结果
+    return injector.validate_injection(tree)
 
-        # 注入内容
-        tree = injector.inject_content(content)
 
-        # 保存文档
-        injector.save_document(tree, output_file)
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="将论文内容注入到Word模板的XML中")
+    parser.add_argument('--template', required=True, help="模板目录（解包后的模板）")
+    parser.add_argument('--output', required=True, help="输出文件（通常为 <模板目录>/word/document.xml）")
+    parser.add_argument('--content', required=True, help="内容文件")
+    args = parser.parse_args()
 
-        # 验证结果
-        if injector.validate_injection(tree):
+    try:
+        if run_inject(args.template, args.output, args.content):
             print("\n✓ 内容注入成功")
         else:
             print("\n⚠️  内容注入可能存在问题")
@@ -343,4 +365,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -11,69 +11,152 @@ python pack_document.py --source <源目录> --output <输出文件> --original
 
 import os
 import sys
+import argparse
+import mmap
 import zipfile
 import shutil
-from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+# 压缩级别：document.xml 占绝大部分体积，级别 3 与默认级别 6 的压缩率相近但速度明显更快
+COMPRESS_LEVEL = 3
+
+# 小于该大小的部件（.rels、[Content_Types].xml 等）直接存储，不做压缩
+STORED_SIZE_THRESHOLD = 4 * 1024
+
+# 固定时间戳，使相同输入打包出的文档逐字节一致，便于复现和缓存
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# 系统生成的杂项文件，不打包进文档（注意 _rels/.rels 本身以点开头，不能按隐藏文件一律跳过）
+IGNORED_NAMES = {'.DS_Store', 'Thumbs.db', 'desktop.ini'}
 
 
 def validate_source_dir(source_dir: str) -> bool:
     """验证源目录"""
-    if not os.path.exists(source_dir):
-        raise Exception(f"源目录不存在: {source_dir}")
-
     word_dir = os.path.join(source_dir, 'word')
-    if not os.path.exists(word_dir):
+
+    # 一次列出word目录，再在内存中检查关键文件
+    try:
+        with os.scandir(word_dir) as entries:
+            names = {entry.name for entry in entries}
+    except OSError:
+        if not os.path.isdir(source_dir):
+            raise Exception(f"源目录不存在: {source_dir}")
         raise Exception("缺少word目录")
 
     # 检查关键文件
     required_files = ['document.xml', 'styles.xml']
     for file in required_files:
-        file_path = os.path.join(word_dir, file)
-        if not os.path.exists(file_path):
-            raise Exception(f"缺少必需文件: {file_path}")
+        if file not in names:
+            raise Exception(f"缺少必需文件: {os.path.join(word_dir, file)}")
 
     return True
 
 
-def create_word_document(source_dir: str, output_path: str):
-    """创建Word文档"""
+def _iter_files(root: str) -> Iterator[Tuple[str, str]]:
+    """遍历目录下的所有文件，生成 (文件路径, ZIP中的路径)"""
+    stack = [(root, '')]
+    while stack:
+        dir_path, prefix = stack.pop()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name in IGNORED_NAMES or name.startswith('._'):
+                    continue
+                if entry.is_dir():
+                    stack.append((entry.path, prefix + name + '/'))
+                else:
+                    yield entry.path, prefix + name
+
+
+def create_word_document(source_dir: str, output_path: str) -> Dict:
+    """创建Word文档，返回打包信息（是否写入document.xml、输出文件大小）"""
     try:
+        wrote_document_xml = False
+
+        # 先收集文件，避免在写入ZIP的同时遍历目录；
+        # 按路径排序保证条目顺序稳定，[Content_Types].xml 会排在最前
+        files = sorted(_iter_files(source_dir), key=lambda item: item[1])
+
         # 创建ZIP文件
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as docx:
-            # 遍历源目录
-            for root, dirs, files in os.walk(source_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # 计算ZIP中的路径
-                    arcname = os.path.relpath(file_path, source_dir)
-                    docx.write(file_path, arcname)
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED,
+                             compresslevel=COMPRESS_LEVEL, allowZip64=False) as docx:
+            for file_path, arcname in files:
+                with open(file_path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+
+                    zinfo = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+                    zinfo.external_attr = 0o644 << 16
+                    if size < STORED_SIZE_THRESHOLD:
+                        zinfo.compress_type = zipfile.ZIP_STORED
+                    else:
+                        zinfo.compress_type = zipfile.ZIP_DEFLATED
+
+                    if arcname == 'word/document.xml' and size:
+                        # 正文XML通常最大，映射到内存后直接交给zlib，省去一次拷贝
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            docx.writestr(zinfo, mm, compresslevel=COMPRESS_LEVEL)
+                    else:
+                        docx.writestr(zinfo, f.read(), compresslevel=COMPRESS_LEVEL)
+
+                if arcname == 'word/document.xml':
+                    wrote_document_xml = True
+
+        # 关闭后才写入中央目录，此时取完整的文件大小
+        packed_size = os.path.getsize(output_path)
 
         print(f"Word文档已创建: {output_path}")
 
+        return {
+            'wrote_document_xml': wrote_document_xml,
+            'packed_size': packed_size
+        }
+
     except Exception as e:
         raise Exception(f"创建Word文档失败: {e}")
 
 
-def validate_output(output_path: str) -> bool:
-    """验证输出文件"""
+def validate_output(output_path: str, pack_info: Optional[Dict] = None) -> bool:
+    """
+    验证输出文件
+
+    pack_info 为 create_word_document 的返回值（packed_size 为输出文件大小）；
+    提供时直接使用打包时记录的信息，不再重新打开生成的文件。设置环境变量 PACK_VERIFY 时额外做完整的ZIP校验。
+    """
     try:
-        # 检查文件存在
-        if not os.path.exists(output_path):
-            raise Exception(f"输出文件不存在: {output_path}")
+        if pack_info is not None:
+            size = pack_info['packed_size']
+            if not pack_info['wrote_document_xml']:
+                raise Exception("无效的Word文档格式")
+        else:
+            # 检查文件存在
+            if not os.path.exists(output_path):
+                raise Exception(f"输出文件不存在: {output_path}")
+
+            size = os.path.getsize(output_path)
+
+            # 验证ZIP结构
+            try:
+                with zipfile.ZipFile(output_path, 'r') as zip_ref:
+                    files = zip_ref.namelist()
+                    if 'word/document.xml' not in files:
+                        raise Exception("无效的Word文档格式")
+            except zipfile.BadZipFile:
+                raise Exception("无效的ZIP文件")
 
         # 检查文件大小
-        size = os.path.getsize(output_path)
         if size < 1024:  # 小于1KB可能有问题
             print(f"警告：文件过小 ({size} bytes)")
 
-        # 验证ZIP结构
-        try:
-            with zipfile.ZipFile(output_path, 'r') as zip_ref:
-                files = zip_ref.namelist()
-                if 'word/document.xml' not in files:
-                    raise Exception("无效的Word文档格式")
-        except zipfile.BadZipFile:
-            raise Exception("无效的ZIP文件")
+        # 完整性校验（按需开启）
+        if os.environ.get('PACK_VERIFY'):
+            try:
+                with zipfile.ZipFile(output_path, 'r') as zip_ref:
+                    bad_file = zip_ref.testzip()
+                    if bad_file:
+                        raise Exception(f"ZIP条目损坏: {bad_file}")
+            except zipfile.BadZipFile:
+                raise Exception("无效的ZIP文件")
 
         print(f"验证通过: {output_path}")
         return True
@@ -94,48 +177,37 @@ def create_backup_if_needed(original_path: str, output_path: str):
             print(f"创建备份失败: {e}")
 
 
-def main():
-    """主函数"""
-    if len(sys.argv) < 5:
-        print("使用方法:")
-        print("  python pack_document.py --source <源目录> --output <输出文件> --original <原始模板文件（可选）>")
-        sys.exit(1)
+def run_pack(source_dir: str, output_path: str, original_path: Optional[str] = None) -> bool:
+    """验证源目录并打包成Word文档，返回输出文件是否通过验证"""
+    # 验证源目录
+    print("验证源目录...")
+    validate_source_dir(source_dir)
 
-    # 解析参数
-    source_dir = None
-    output_path = None
-    original_path = None
-
-    for i, arg in enumerate(sys.argv):
-        if arg == '--source' and i + 1 < len(sys.argv):
-            source_dir = sys.argv[i + 1]
-        elif arg == '--output' and i + 1 < len(sys.argv):
-            output_path = sys.argv[i + 1]
-        elif arg == '--original' and i + 1 < len(sys.argv):
-            original_path = sys.argv[i + 1]
-
-    if not source_dir or not output_path:
-        print("参数错误：缺少必需的参数")
-        sys.exit(1)
+    # 创建备份（如果指定了原始文件）
+    if original_path:
+        create_backup_if_needed(original_path, output_path)
 
-    try:
-        # 验证源目录
-        print("验证源目录...")
-        validate_source_dir(source_dir)
+    # 创建Word文档
+    print("正在创建Word文档...")
+    pack_info = create_word_document(source_dir, output_path)
+
+    # 验证输出文件
+    print("验证输出文件...")
+    return validate_output(output_path, pack_info)
 
-        # 创建备份（如果指定了原始文件）
-        if original_path:
-            create_backup_if_needed(original_path, output_path)
 
-        # 创建Word文档
-        print("正在创建Word文档...")
-        create_word_document(source_dir, output_path)
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="将编辑后的XML文件重新打包成Word文档")
+    parser.add_argument('--source', required=True, help="源目录")
+    parser.add_argument('--output', required=True, help="输出文件")
+    parser.add_argument('--original', help="原始模板文件（可选，用于创建备份）")
+    args = parser.parse_args()
 
-        # 验证输出文件
-        print("验证输出文件...")
-        if validate_output(output_path):
+    try:
+        if run_pack(args.source, args.output, args.original):
             print("\n✓ Word文档创建成功")
-            print(f"输出文件: {output_path}")
+            print(f"输出文件: {args.output}")
         else:
             print("\n⚠️  Word文档创建可能存在问题")
 
@@ -145,4 +217,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文档生成流水线
+
+默认直接在内存中修改模板 .docx：只解析 word/document.xml 并注入内容，
+其余条目原样复制到新文档，不落地解包目录。
+指定 --workdir 时沿用 解包模板 → 注入内容 → 打包文档 的旧流程，
+并保留解包目录便于检查
+
+使用方法：
+python pipeline.py --template <模板文件> --content <内容文件> --output <输出文件> [--workdir <工作目录>]
+"""
+
+import os
+import sys
+import argparse
+import zipfile
+from typing import Dict, Optional
+
+from unpack_template import run_unpack
+from inject_content import WordDocumentInjector, load_content_from_file, run_inject
+from pack_document import COMPRESS_LEVEL, run_pack, validate_output
+
+DOCUMENT_XML = 'word/document.xml'
+
+
+def edit_docx_inplace(template_docx: str, content: Dict, output_docx: str) -> bool:
+    """
+    不解包模板，直接在内存中注入内容并写出新的Word文档
+
+    Args:
+        template_docx: 模板文件（.docx）
+        content: 论文内容（load_content_from_file 的返回值）
+        output_docx: 输出的Word文档，不能与模板为同一文件
+
+    Returns:
+        注入结果和输出文件是否都通过验证
+    """
+    if os.path.abspath(template_docx) == os.path.abspath(output_docx):
+        raise Exception(f"输出文件不能覆盖模板: {output_docx}")
+
+    output_dir = os.path.dirname(output_docx)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    injector = WordDocumentInjector()
+    try:
+        with zipfile.ZipFile(template_docx, 'r') as zin, \
+                zipfile.ZipFile(output_docx, 'w', zipfile.ZIP_DEFLATED,
+                                compresslevel=COMPRESS_LEVEL) as zout:
+            infos = zin.infolist()
+            if not any(info.filename == DOCUMENT_XML for info in infos):
+                raise Exception("无效的Word文档格式")
+
+            # 保持模板中的条目顺序（[Content_Types].xml 在前），
+            # 其余条目沿用原有的压缩方式和时间戳原样复制。
+            # 传入 ZipInfo 时 writestr 不使用归档的 compresslevel，需逐条指定，
+            # 才能与 pack_document 的压缩级别一致
+            for info in infos:
+                if info.filename != DOCUMENT_XML:
+                    zout.writestr(info, zin.read(info), compresslevel=COMPRESS_LEVEL)
+                    continue
+                tree = injector.load_document_bytes(zin.read(info))
+                injector.inject_tree(tree, content)
+                zout.writestr(info, injector.serialize_document(tree), compresslevel=COMPRESS_LEVEL)
+    except zipfile.BadZipFile:
+        raise Exception(f"无效的模板文件: {template_docx}")
+
+    print(f"Word文档已创建: {output_docx}")
+    injected = injector.validate_injection(tree)
+    pack_info = {'wrote_document_xml': True, 'packed_size': os.path.getsize(output_docx)}
+    return validate_output(output_docx, pack_info) and injected
+
+
+def build_document(template_path: str, content_file: str, output_path: str,
+                   work_dir: Optional[str] = None) -> bool:
+    """
+    由模板和内容文件生成Word文档
+
+    Args:
+        template_path: 模板文件（.docx）
+        content_file: 内容文件
+        output_path: 输出的Word文档
+        work_dir: 解包目录；不指定时直接在内存中修改模板（edit_docx_inplace）
+
+    Returns:
+        注入结果和输出文件是否都通过验证
+    """
+    if work_dir is None:
+        return edit_docx_inplace(template_path, load_content_from_file(content_file), output_path)
+
+    run_unpack(template_path, work_dir)
+    injected = run_inject(work_dir, os.path.join(work_dir, 'word', 'document.xml'), content_file)
+    return run_pack(work_dir, output_path) and injected
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="由模板和内容文件一次性生成Word文档")
+    parser.add_argument('--template', required=True, help="模板文件（.docx）")
+    parser.add_argument('--content', required=True, help="内容文件")
+    parser.add_argument('--output', required=True, help="输出文件")
+    parser.add_argument('--workdir', help="解包目录（可选，指定时改用解包→注入→打包流程）")
+    args = parser.parse_args()
+
+    try:
+        if build_document(args.template, args.content, args.output, args.workdir):
+            print("\n✓ Word文档生成成功")
+            print(f"输出文件: {args.output}")
+        else:
+            print("\n⚠️  Word文档生成可能存在问题")
+
+    except Exception as e:
+        print(f"错误：{e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
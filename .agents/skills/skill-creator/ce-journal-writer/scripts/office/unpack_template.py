@@ -11,9 +11,8 @@ python unpack_template.py --template <模板文件> --output <输出目录>
 
 import os
 import sys
-import shutil
+import argparse
 import zipfile
-from pathlib import Path
 
 
 def unpack_template(template_path: str, output_dir: str):
@@ -33,9 +32,12 @@ def unpack_template(template_path: str, output_dir: str):
         with zipfile.ZipFile(template_path, 'r') as zip_ref:
             zip_ref.extractall(output_dir)
 
-        # 验证解包结果
+        # 验证解包结果：一次列出word目录，后续检查和报告都复用该结果
         word_dir = os.path.join(output_dir, 'word')
-        if not os.path.exists(word_dir):
+        try:
+            with os.scandir(word_dir) as entries:
+                word_entries = {entry.name: entry for entry in entries}
+        except OSError:
             raise Exception("解包失败：缺少word目录")
 
         # 检查关键文件
@@ -47,18 +49,16 @@ def unpack_template(template_path: str, output_dir: str):
         ]
 
         for file in required_files:
-            file_path = os.path.join(word_dir, file)
-            if not os.path.exists(file_path):
+            if file not in word_entries:
                 print(f"警告：缺少文件 {file}")
 
         # 生成解包报告
         print("\n=== 解包完成 ===")
         print(f"解包文件数: {len(os.listdir(output_dir))}")
-        print(f"word目录文件: {len(os.listdir(word_dir))}")
+        print(f"word目录文件: {len(word_entries)}")
         print("\n主要文件:")
-        for file in sorted(os.listdir(word_dir)):
-            file_path = os.path.join(word_dir, file)
-            size = os.path.getsize(file_path)
+        for file in sorted(word_entries):
+            size = word_entries[file].stat().st_size
             print(f"  {file} ({size} bytes)")
 
         print(f"\n解包完成，可在 {output_dir} 中编辑XML文件")
@@ -94,35 +94,25 @@ def validate_template(template_path: str) -> bool:
         return False
 
 
-def main():
-    """主函数"""
-    if len(sys.argv) < 5:
-        print("使用方法:")
-        print("  python unpack_template.py --template <模板文件> --output <输出目录>")
-        sys.exit(1)
+def run_unpack(template_path: str, output_dir: str):
+    """验证并解包模板"""
+    # 验证模板
+    if not validate_template(template_path):
+        raise Exception("模板验证失败")
 
-    # 解析参数
-    template_path = None
-    output_dir = None
+    # 解包模板
+    unpack_template(template_path, output_dir)
 
-    for i, arg in enumerate(sys.argv):
-        if arg == '--template' and i + 1 < len(sys.argv):
-            template_path = sys.argv[i + 1]
-        elif arg == '--output' and i + 1 < len(sys.argv):
-            output_dir = sys.argv[i + 1]
 
-    if not template_path or not output_dir:
-        print("参数错误：缺少必需的参数")
-        sys.exit(1)
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="解包Word模板文件，为XML编辑做准备")
+    parser.add_argument('--template', required=True, help="模板文件（.docx）")
+    parser.add_argument('--output', required=True, help="输出目录")
+    args = parser.parse_args()
 
     try:
-        # 验证模板
-        if not validate_template(template_path):
-            print("模板验证失败，退出")
-            sys.exit(1)
-
-        # 解包模板
-        unpack_template(template_path, output_dir)
+        run_unpack(args.template, args.output)
 
     except Exception as e:
         print(f"错误：{e}")
@@ -130,4 +120,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -16,6 +16,67 @@ import sys
 from typing import Dict, List, Tuple
 
 
+# 超过该长度的文本显然不是摘要，直接拒绝，不再做逐项检查
+MAX_ABSTRACT_CHARS = 10000
+
+# 第一人称表达，按由长到短排列，使交替匹配优先命中最长的表达
+_FIRST_PERSON_RE = re.compile('|'.join(map(re.escape, [
+    "本论文",
+    "本研究",
+    "笔者认为",
+    "本文认为",
+    "本文",
+    "作者",
+    "我们",
+    "笔者",
+    "我"
+])))
+
+# 研究目的（为了...、针对...、根据...）
+_PURPOSE_RE = re.compile('|'.join([
+    r"为了",
+    r"针对",
+    r"根据",
+    r"为解决"
+]))
+
+# 研究方法（通过...、采用...、使用...、基于...）
+_METHOD_RE = re.compile('|'.join([
+    r"通过",
+    r"采用",
+    r"使用",
+    r"基于",
+    r"利用",
+    r"运用",
+    r"设计了",
+    r"构建了"
+]))
+
+# 研究结果（结果表明、显示、发现、提出、建立）
+_RESULT_RE = re.compile('|'.join([
+    r"结果表明",
+    r"结果显示",
+    r"研究发现",
+    r"提出",
+    r"建立",
+    r"构建",
+    r"实现了",
+    r"达到"
+]))
+
+# 研究结论（表明、说明、证实、具有...意义、为...提供...）
+_CONCLUSION_RE = re.compile('|'.join([
+    r"表明",
+    r"说明",
+    r"证实",
+    r"具有",
+    r"为",
+    r"提供",
+    r"奠定",
+    r"奠定基础"
+]))
+
+
 def check_word_count(abstract: str) -> Tuple[bool, int, str]:
     """检查摘要字数"""
     # 去除空格和换行符
@@ -31,24 +92,8 @@ def check_word_count(abstract: str) -> Tuple[bool, int, str]:
 
 
 def check_third_person(abstract: str) -> Tuple[bool, List[str], str]:
-    """检查是否使用第三人称"""
-    first_person_patterns = [
-        r"本文",
-        r"本论文",
-        r"本研究",
-        r"作者",
-        r"我们",
-        r"我",
-        r"笔者",
-        r"笔者认为",
-        r"本文认为"
-    ]
-
-    violations = []
-    for pattern in first_person_patterns:
-        matches = re.findall(pattern, abstract)
-        if matches:
-            violations.extend(matches)
+    """检查是否使用第三人称（abstract 为已规范化的摘要文本）"""
+    violations = _FIRST_PERSON_RE.findall(abstract)
 
     if violations:
         return False, violations, f"发现第一人称表达：{', '.join(violations)}"
@@ -57,67 +102,14 @@ def check_third_person(abstract: str) -> Tuple[bool, List[str], str]:
 
 
 def check_content_structure(abstract: str) -> Tuple[bool, Dict[str, bool], str]:
-    """检查摘要内容结构"""
+    """检查摘要内容结构（abstract 为已规范化的摘要文本）"""
     structure_check = {
-        'purpose': False,
-        'method': False,
-        'result': False,
-        'conclusion': False
+        'purpose': bool(_PURPOSE_RE.search(abstract)),        # 研究目的
+        'method': bool(_METHOD_RE.search(abstract)),          # 研究方法
+        'result': bool(_RESULT_RE.search(abstract)),          # 研究结果
+        'conclusion': bool(_CONCLUSION_RE.search(abstract))   # 研究结论
     }
 
-    # 检查研究目的（为了...、针对...、根据...）
-    purpose_patterns = [
-        r"为了",
-        r"针对",
-        r"根据",
-        r"针对",
-        r"为解决"
-    ]
-    if any(re.search(pattern, abstract) for pattern in purpose_patterns):
-        structure_check['purpose'] = True
-
-    # 检查研究方法（通过...、采用...、使用...、基于...）
-    method_patterns = [
-        r"通过",
-        r"采用",
-        r"使用",
-        r"基于",
-        r"利用",
-        r"运用",
-        r"设计了",
-        r"构建了"
-    ]
-    if any(re.search(pattern, abstract) for pattern in method_patterns):
-        structure_check['method'] = True
-
-    # 检查研究结果（结果表明、显示、发现、提出、建立）
-    result_patterns = [
-        r"结果表明",
-        r"结果显示",
-        r"研究发现",
-        r"提出",
-        r"建立",
-        r"构建",
-        r"实现了",
-        r"达到"
-    ]
-    if any(re.search(pattern, abstract) for pattern in result_patterns):
-        structure_check['result'] = True
-
-    # 检查研究结论（表明、说明、证实、具有...意义、为...提供...）
-    conclusion_patterns = [
-        r"表明",
-        r"说明",
-        r"证实",
-        r"具有",
-        r"为",
-        r"提供",
-        r"奠定",
-        r"奠定基础"
-    ]
-    if any(re.search(pattern, abstract) for pattern in conclusion_patterns):
-        structure_check['conclusion'] = True
-
     missing_elements = [k for k, v in structure_check.items() if not v]
 
     if missing_elements:
@@ -137,8 +129,22 @@ def validate_abstract(abstract: str) -> Dict:
         'suggestions': []
     }
 
+    # 只做一次规范化，后续检查共用同一个字符串
+    normalized = abstract.strip()
+
+    # 过长文本直接拒绝
+    if len(normalized) > MAX_ABSTRACT_CHARS:
+        msg = f"文本过长（{len(normalized)}字），不像是摘要，请只提供摘要内容"
+        result['valid'] = False
+        result['word_count'] = {'valid': False, 'count': len(normalized), 'message': msg}
+        result['third_person']['message'] = "已跳过"
+        result['content_structure']['message'] = "已跳过"
+        result['suggestions'].append(msg)
+        result['summary'] = "✗ 摘要存在以下问题："
+        return result
+
     # 检查字数
-    wc_valid, wc_count, wc_msg = check_word_count(abstract)
+    wc_valid, wc_count, wc_msg = check_word_count(normalized)
     result['word_count'] = {
         'valid': wc_valid,
         'count': wc_count,
@@ -149,7 +155,7 @@ def validate_abstract(abstract: str) -> Dict:
         result['suggestions'].append(wc_msg)
 
     # 检查第三人称
-    tp_valid, tp_violations, tp_msg = check_third_person(abstract)
+    tp_valid, tp_violations, tp_msg = check_third_person(normalized)
     result['third_person'] = {
         'valid': tp_valid,
         'violations': tp_violations,
@@ -160,7 +166,7 @@ def validate_abstract(abstract: str) -> Dict:
         result['suggestions'].append(tp_msg)
 
     # 检查内容结构
-    cs_valid, cs_elements, cs_msg = check_content_structure(abstract)
+    cs_valid, cs_elements, cs_msg = check_content_structure(normalized)
     result['content_structure'] = {
         'valid': cs_valid,
         'elements': cs_elements,
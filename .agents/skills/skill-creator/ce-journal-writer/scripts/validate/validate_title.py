@@ -16,14 +16,34 @@
 import re
 import sys
 import os
+import argparse
 from typing import Dict, List, Tuple
 
 
+# 非中文字符（Unicode中文范围之外）的连续片段
+_NON_CHINESE_RE = re.compile(r'[^\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]+')
+
+# 冗余词（都是普通字符串，直接用 in 判断子串，不必经过正则引擎）
+_REDUNDANT_WORDS = (
+    "的研究",
+    "的探索",
+    "的实践",
+    "的思考",
+    "的探讨",
+    "的分析",
+    "的调查",
+    "的研究报告",
+    "的初步研究"
+)
+
+# 题目中不应出现的标点符号
+_PUNCT_RE = re.compile(r'[，。！？；：""（）【】\[\]\{\}\-…—]')
+
+
 def count_chinese_chars(text: str) -> int:
     """统计中文字符数"""
-    # Unicode中文范围
-    chinese_pattern = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]')
-    return len(chinese_pattern.findall(text))
+    # 一次删掉整段非中文字符，剩下的都是中文；按段替换比逐字匹配中文少得多
+    return len(_NON_CHINESE_RE.sub('', text))
 
 
 def check_title_length(title: str) -> Tuple[bool, int, str]:
@@ -44,21 +64,9 @@ def check_title_content(title: str) -> Tuple[bool, List[str], str]:
     problems = []
 
     # 检查冗余词
-    redundant_patterns = [
-        r"的研究",
-        r"的探索",
-        r"的实践",
-        r"的思考",
-        r"的探讨",
-        r"的分析",
-        r"的调查",
-        r"的研究报告",
-        r"的初步研究"
-    ]
-
-    for pattern in redundant_patterns:
-        if re.search(pattern, title):
-            problems.append(f"包含冗余词：{pattern}")
+    for word in _REDUNDANT_WORDS:
+        if word in title:
+            problems.append(f"包含冗余词：{word}")
 
     # 检查标题长度（过短可能缺乏信息）
     chinese_count = count_chinese_chars(title)
@@ -70,7 +78,7 @@ def check_title_content(title: str) -> Tuple[bool, List[str], str]:
         problems.append("建议包含'计算机'或'教育'关键词")
 
     # 检查是否使用标点符号
-    if re.search(r'[，。！？；：""''（）【】\[\]\{\}\-…—]', title):
+    if _PUNCT_RE.search(title):
         problems.append("题目中不应包含标点符号")
 
     # 检查格式是否规范
@@ -183,30 +191,42 @@ def read_title_from_file(file_path: str) -> str:
         return f"读取文件失败：{str(e)}"
 
 
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行解析器：直接给出题目，或用 --file 从文件读取
+
+    未加引号的题目会被 shell 拆成多个参数，按空格拼回原文。
+    nargs='*' 的位置参数不能放进互斥组，两种来源的互斥在 main 中检查
+    """
+    parser = argparse.ArgumentParser(description="检查题目是否符合计算机教育期刊要求")
+    parser.add_argument('title', nargs='*', help="题目内容")
+    parser.add_argument('--file', help="从文件中读取题目")
+    return parser
+
+
+_PARSER = _build_parser()
+
+
 def main():
     """主函数"""
-    if len(sys.argv) < 2:
-        print("使用方法:")
-        print("  python validate_title.py <题目内容>")
-        print("  python validate_title.py --file <文件路径>")
-        sys.exit(1)
-
-    if sys.argv[1] == '--file':
-        if len(sys.argv) != 3:
-            print("使用方法: python validate_title.py --file <文件路径>")
-            sys.exit(1)
+    args = _PARSER.parse_args()
+
+    if args.file is not None and args.title:
+        _PARSER.error("题目内容和 --file 只能指定一个")
+    if args.file is None and not args.title:
+        _PARSER.error("请提供题目内容或 --file <文件路径>")
 
-        file_path = sys.argv[2]
-        if not os.path.exists(file_path):
-            print(f"文件不存在: {file_path}")
+    if args.file is not None:
+        if not os.path.exists(args.file):
+            print(f"文件不存在: {args.file}")
             sys.exit(1)
 
-        title = read_title_from_file(file_path)
+        title = read_title_from_file(args.file)
         if title.startswith("读取文件失败"):
             print(title)
             sys.exit(1)
     else:
-        title = sys.argv[1]
+        title = ' '.join(args.title)
 
     print(f"验证题目：{title}")
     print()
@@ -14,9 +14,89 @@
 import re
 import sys
 import os
+import argparse
 from typing import Dict, List, Tuple
 
 
+try:
+    # 可选：大文本用 NumPy 按码位批量判断字符类别
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# 文本不少于该长度时才使用 NumPy；短文本编码和建数组的开销超过收益
+NUMPY_MIN_CHARS = 5000
+
+# 中文字符（Unicode中文范围）
+_CHINESE_RANGES = (
+    (0x4e00, 0x9fff),
+    (0x3400, 0x4dbf),
+    (0x20000, 0x2a6df),
+    (0x2a700, 0x2b73f),
+    (0x2b740, 0x2b81f),
+    (0x2b820, 0x2ceaf),
+)
+_CHINESE_CLASS = '[' + ''.join(f'\\U{lo:08x}-\\U{hi:08x}' for lo, hi in _CHINESE_RANGES) + ']'
+
+# 标点符号（固定的少量字符，逐个用 str.count 计数）
+_PUNCT_CHARS = '，。！？；："（）、【】[]{}-…—'
+
+# 英文单词
+_ENGLISH_RE = re.compile(r'\b[a-zA-Z]+\b')
+
+# 非数字字符的连续片段（删掉后剩下的都是数字）
+_NON_DIGIT_RE = re.compile(r'\D+')
+
+# 一次扫描完成分类计数：连续的中文、数字各作为一段匹配，英文按单词匹配。
+# 三类字符互不相交，合并后与分别扫描的计数结果相同
+_TOKEN_RE = re.compile(
+    rf'(?P<chinese>{_CHINESE_CLASS}+)'
+    r'|(?P<english>\b[a-zA-Z]+\b)'
+    r'|(?P<digit>\d+)'
+)
+
+
+def _count_classes(text: str) -> Dict[str, int]:
+    """只扫描一遍文本，每段连续的同类字符只产生一个匹配，按段长度累加"""
+    counts = {'chinese': 0, 'english': 0, 'digit': 0}
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'english':
+            counts[kind] += 1
+        else:
+            counts[kind] += match.end() - match.start()
+    counts['punct'] = _count_punct(text)
+    return counts
+
+
+def _count_punct(text: str) -> int:
+    """统计标点符号：字符集很小，逐个用C实现的 str.count 计数比正则更快"""
+    return sum(map(text.count, _PUNCT_CHARS))
+
+
+def _count_classes_numpy(text: str) -> Dict[str, int]:
+    """
+    与 _count_classes 结果相同的 NumPy 实现
+
+    中文是固定的码位区间，在 UTF-32 码位数组上做向量化比较；
+    英文单词依赖词边界、数字需要Unicode数字判断，仍交给正则统计；
+    数字按段删除非数字字符后取剩余长度，不逐个匹配数字
+    """
+    # 命令行参数中的非法字节会变成单独的代理码位，surrogatepass 保留它们
+    # （代理码位不在中文范围内，不影响计数）
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    chinese = 0
+    for lo, hi in _CHINESE_RANGES:
+        chinese += int(np.count_nonzero((codes >= lo) & (codes <= hi)))
+    return {
+        'chinese': chinese,
+        'english': _ENGLISH_RE.subn('', text)[1],
+        'digit': len(_NON_DIGIT_RE.sub('', text)),
+        'punct': _count_punct(text),
+    }
+
+
 def count_text_words(text: str, include_chars: List[str] = None) -> Dict:
     """
     统计文本字数
@@ -37,34 +117,31 @@ def count_text_words(text: str, include_chars: List[str] = None) -> Dict:
     # 统计总字符数（包含所有字符）
     total_chars = len(text)
 
-    # 统计中文字数（Unicode范围）
-    chinese_pattern = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]')
-    chinese_count = len(chinese_pattern.findall(text))
-
-    # 统计英文单词数
-    english_words = re.findall(r'\b[a-zA-Z]+\b', text)
-    english_word_count = len(english_words)
-
-    # 统计数字个数
-    digit_count = len(re.findall(r'\d', text))
-
-    # 统计标点符号
-    punctuation_count = len(re.findall(r'[，。！？；：""''（）、【】\[\]\{\}\-…—]', text))
+    # 统计中文字数、英文单词数、数字个数和标点符号数
+    if HAS_NUMPY and total_chars >= NUMPY_MIN_CHARS:
+        counts = _count_classes_numpy(text)
+    else:
+        counts = _count_classes(text)
 
     # 统计纯文本字数（不含图表、公式等）
     plain_text_chars = total_chars
 
     return {
         'total_chars': total_chars,
-        'chinese_count': chinese_count,
-        'english_word_count': english_word_count,
-        'digit_count': digit_count,
-        'punctuation_count': punctuation_count,
+        'chinese_count': counts['chinese'],
+        'english_word_count': counts['english'],
+        'digit_count': counts['digit'],
+        'punctuation_count': counts['punct'],
         'plain_text_chars': plain_text_chars,
-        'estimated_word_count': int(plain_text_chars / 2.5)  # 估算字数（英文算1字，中文算1字）
+        'estimated_word_count': estimate_word_count(plain_text_chars)
     }
 
 
+def estimate_word_count(plain_text_chars: int) -> int:
+    """由纯文本字符数估算字数（英文算1字，中文算1字）"""
+    return int(plain_text_chars / 2.5)
+
+
 def check_word_limit(count_result: Dict, limit: int = 6000) -> Tuple[bool, Dict, str]:
     """
     检查字数限制
@@ -160,9 +237,10 @@ def validate_paper(text: str, limit: int = 6000) -> Dict:
     parts_result = analyze_content_parts(text)
     parts_count = {}
     for part_name, part_text in parts_result.items():
-        if part_text.strip():
-            part_count = count_text_words(part_text)['estimated_word_count']
-            parts_count[part_name] = part_count
+        # 各部分只需要估算字数，它只取决于字符数，不必再对每部分做分类统计
+        part_chars = len(part_text.strip())
+        if part_chars:
+            parts_count[part_name] = estimate_word_count(part_chars)
 
     result = {
         'valid': word_check,
@@ -177,7 +255,10 @@ def validate_paper(text: str, limit: int = 6000) -> Dict:
 
     # 生成建议
     if not word_check:
-        result['suggestions'].append(f"字数超限，建议删除不必要的内容（可参考各部分字数分析）")
+        result['suggestions'].append("字数超限，建议删除不必要的内容（可参考各部分字数分析）")
+
+    # 题目按汉字数限制（题目很短，单独统计的开销可以忽略）
+    title_chinese_count = _count_classes(parts_result['题目'])['chinese'] if '题目' in parts_count else 0
 
     # 分析各部分字数
     for part_name, count in parts_count.items():
@@ -185,34 +266,46 @@ def validate_paper(text: str, limit: int = 6000) -> Dict:
             result['suggestions'].append(f"{part_name}字数{count}字，建议控制在200-300字")
         elif part_name == '正文' and count > 4500:
             result['suggestions'].append(f"{part_name}字数过多，建议精简内容")
-        elif part_name == '题目' and len(count_result['chinese_count']) > 20:
+        elif part_name == '题目' and title_chinese_count > 20:
             result['suggestions'].append(f"{part_name}字数超限，题目不超过20字")
 
     return result
 
 
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行解析器：直接给出文本，或用 --file 从文件读取
+
+    未加引号的文本会被 shell 拆成多个参数，按空格拼回原文。
+    nargs='*' 的位置参数不能放进互斥组，两种来源的互斥在 main 中检查
+    """
+    parser = argparse.ArgumentParser(description="统计论文字数并检查是否符合期刊要求")
+    parser.add_argument('text', nargs='*', help="文本内容")
+    parser.add_argument('--file', help="从文件中读取文本")
+    return parser
+
+
+_PARSER = _build_parser()
+
+
 def main():
     """主函数"""
-    if len(sys.argv) < 2:
-        print("使用方法:")
-        print("  python validate_wordcount.py <文本内容>")
-        print("  python validate_wordcount.py --file <文件路径>")
-        sys.exit(1)
-
-    if sys.argv[1] == '--file':
-        if len(sys.argv) != 3:
-            print("使用方法: python validate_wordcount.py --file <文件路径>")
-            sys.exit(1)
+    args = _PARSER.parse_args()
+
+    if args.file is not None and args.text:
+        _PARSER.error("文本内容和 --file 只能指定一个")
+    if args.file is None and not args.text:
+        _PARSER.error("请提供文本内容或 --file <文件路径>")
 
-        file_path = sys.argv[2]
-        if not os.path.exists(file_path):
-            print(f"文件不存在: {file_path}")
+    if args.file is not None:
+        if not os.path.exists(args.file):
+            print(f"文件不存在: {args.file}")
             sys.exit(1)
 
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(args.file, 'r', encoding='utf-8') as f:
             text = f.read()
     else:
-        text = sys.argv[1]
+        text = ' '.join(args.text)
 
     # 验证论文
     result = validate_paper(text)